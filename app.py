@@ -1,9 +1,19 @@
 
-from flask import Flask, render_template, request, redirect, session, url_for, jsonify
+from flask import Flask, render_template, request, redirect, session, url_for, jsonify, make_response
 from flask_sqlalchemy import SQLAlchemy
+from markupsafe import Markup
+from werkzeug.security import safe_join
+from functools import lru_cache
 from algoritmo import detect_all_biases
+import gzip
+import hashlib
 import os
 
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
 app = Flask(__name__)
 app.secret_key = os.environ.get("MINDTRADE_SECRET", "dev-secret")
 
@@ -47,6 +57,122 @@ class Trade(db.Model):
     entry_time = db.Column(db.String(50))
     exit_time = db.Column(db.String(50))
 
+# -------------------
+# Caching & Compression
+# -------------------
+# Keys the cached intro/login/register pages and the bias cards. Bump when those
+# templates or the detector wording change, so nothing rendered by the old
+# templates is served any more.
+REPORT_VERSION = "1"
+
+COMPRESSIBLE_MIMETYPES = {"text/html", "application/json"}
+COMPRESS_MIN_SIZE = 500
+STATIC_MAX_AGE = 365 * 24 * 3600
+
+_static_fingerprints = {}
+
+def static_fingerprint(filename):
+    path = safe_join(app.static_folder, filename)
+    try:
+        mtime = os.path.getmtime(path)
+    except (TypeError, OSError):
+        return None
+    key = (filename, mtime)
+    if key not in _static_fingerprints:
+        with open(path, "rb") as f:
+            _static_fingerprints[key] = hashlib.md5(f.read()).hexdigest()[:12]
+    return _static_fingerprints[key]
+
+@app.url_defaults
+def fingerprint_static_urls(endpoint, values):
+    # url_for('static', ...) -> /static/logo.jpg?v=<content hash>
+    if endpoint == "static" and "v" not in values:
+        fingerprint = static_fingerprint(values.get("filename", ""))
+        if fingerprint:
+            values["v"] = fingerprint
+
+def negotiate_encoding():
+    if brotli is not None and request.accept_encodings["br"]:
+        return "br"
+    if request.accept_encodings["gzip"]:
+        return "gzip"
+    return None
+
+def compress(data, encoding):
+    if encoding == "br":
+        return brotli.compress(data, quality=5)
+    return gzip.compress(data, compresslevel=6)
+
+@lru_cache(maxsize=None)
+def _render_static_page(template_name, version, encoding):
+    data = render_template(template_name).encode("utf-8")
+    if encoding is None or len(data) < COMPRESS_MIN_SIZE:
+        return data, None
+    return compress(data, encoding), encoding
+
+def render_static_page(template_name):
+    """Render (and compress) a page that does not depend on the request, once per process."""
+    if app.debug:
+        return render_template(template_name)
+    data, encoding = _render_static_page(template_name, REPORT_VERSION, negotiate_encoding())
+    response = make_response(data)
+    response.vary.add("Accept-Encoding")
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+@lru_cache(maxsize=1024)
+def _render_bias_card(version, bias_name, bias_detected, confidence_score, explanation):
+    bias_data = {
+        "bias_detected": bias_detected,
+        "confidence_score": confidence_score,
+        "explanation": explanation,
+    }
+    return Markup(render_template("_bias_card.html", bias_name=bias_name, bias_data=bias_data))
+
+def render_results(bias_results, total_trades):
+    render_card = _render_bias_card.__wrapped__ if app.debug else _render_bias_card
+    bias_cards = {
+        name: render_card(REPORT_VERSION, name, data["bias_detected"],
+                          data["confidence_score"], data["explanation"])
+        for name, data in bias_results["details"].items()
+    }
+    return render_template("results.html", bias_results=bias_results, bias_cards=bias_cards,
+                           total_trades=total_trades)
+
+@app.after_request
+def cache_static_files(response):
+    if (request.endpoint == "static"
+            and response.status_code in (200, 304)
+            and request.args.get("v")
+            and request.args["v"] == static_fingerprint(request.view_args["filename"])):
+        # The URL changes whenever the file does, so it can be cached forever.
+        # Stale or made-up fingerprints keep Flask's default headers.
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = STATIC_MAX_AGE
+        response.cache_control.immutable = True
+    return response
+
+@app.after_request
+def compress_response(response):
+    if (response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or response.direct_passthrough
+            or not 200 <= response.status_code < 300
+            or "Content-Encoding" in response.headers):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_SIZE:
+        return response
+
+    encoding = negotiate_encoding()
+    if encoding:
+        response.set_data(compress(data, encoding))
+        response.headers["Content-Encoding"] = encoding
+    return response
+
 # -------------------
 # Routes
 # -------------------
@@ -56,7 +182,7 @@ def root():
 
 @app.route("/intro")
 def intro():
-    return render_template("intro.html")
+    return render_static_page("intro.html")
 
 @app.route("/home")
 def home():
@@ -85,7 +211,7 @@ def register():
         db.session.commit()
         session["user"] = username
         return redirect(url_for("trade_input"))
-    return render_template("register.html")
+    return render_static_page("register.html")
 
 @app.route("/login", methods=["GET", "POST"])
 def login():
@@ -98,7 +224,7 @@ def login():
             return render_template("login.html", error="Invalid credentials.")
         session["user"] = username
         return redirect(url_for("home"))
-    return render_template("login.html")
+    return render_static_page("login.html")
 
 @app.route("/logout")
 def logout():
@@ -183,7 +309,7 @@ def trade_input():
             ]
         
         bias_results = detect_all_biases(trades_data)
-        return render_template("results.html", bias_results=bias_results, total_trades=len(trades_data))
+        return render_results(bias_results, len(trades_data))
 
     return render_template("trade_input.html")
 
@@ -225,7 +351,7 @@ def results():
         for t in user.trades
     ]
     bias_results = detect_all_biases(trades_data)
-    return render_template("results.html", bias_results=bias_results, total_trades=len(trades_data))
+    return render_results(bias_results, len(trades_data))
 
 # Always ensure database tables exist at startup
 with app.app_context():
@@ -0,0 +1,402 @@
+"""
+Load generator for the MindTrade Flask routes.
+
+Starts the app under gunicorn (against a throwaway SQLite file by default, or
+any DATABASE_URL such as a local Postgres) and runs simulated users through
+register -> login -> trade_input (multi-row) -> /results -> /home, round after
+round, so that account histories keep growing during the run.
+
+Latency percentiles, throughput, error rates and response sizes are reported
+per route and per history size, and the whole report is written as JSON so a before/after pair
+can be compared:
+
+    python loadtest.py --out before.json
+    python loadtest.py --out after.json --compare before.json
+
+Only the standard library is used; gunicorn comes from requirements.txt.
+"""
+
+import argparse
+import http.cookiejar
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+
+ROUTES = ["register", "login", "trade_input", "results", "home"]
+
+# Status codes the app answers with when a step succeeds
+EXPECTED_STATUS = {
+    "register": 302,
+    "login": 302,
+    "trade_input": 200,
+    "results": 200,
+    "home": 200,
+}
+
+ASSETS = [("AAPL", "stock"), ("SPY", "etf"), ("BTC", "crypto"), ("EUR/USD", "forex"), ("TSLA", "stock")]
+REASONS = ["technical_analysis", "fundamental_analysis", "news_based", "fomo", "revenge", "swing", "other"]
+NOTES = [
+    "Followed my plan, felt calm.",
+    "Everyone was buying, didn't want to miss out.",
+    "Angry after the last loss, wanted it back.",
+    "Confident in the setup, sized up.",
+    "Read some news confirming my view.",
+]
+
+
+# -------------------
+# HTTP client
+# -------------------
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    # Time each route on its own instead of following the redirect chain
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples: List[Dict] = []
+
+    def add(self, route: str, history: int, start: float, end: float, ok: bool, size: int):
+        with self.lock:
+            self.samples.append({"route": route, "history": history, "start": start, "end": end,
+                                 "ok": ok, "bytes": size})
+
+
+class SimulatedUser:
+    def __init__(self, base_url: str, name: str, recorder: Recorder, rng: random.Random, timeout: float,
+                 accept_encoding: str):
+        self.base_url = base_url
+        self.username = name
+        self.password = "pw-" + name
+        self.recorder = recorder
+        self.rng = rng
+        self.timeout = timeout
+        self.accept_encoding = accept_encoding
+        self.history = 0
+        self._new_session()
+
+    def _new_session(self):
+        jar = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(jar), _NoRedirect)
+
+    def _request(self, route: str, path: str, form: Optional[List] = None) -> bool:
+        data = urllib.parse.urlencode(form).encode() if form is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data)
+        if self.accept_encoding:
+            req.add_header("Accept-Encoding", self.accept_encoding)
+        size = 0
+        start = time.perf_counter()
+        try:
+            with self.opener.open(req, timeout=self.timeout) as resp:
+                # urllib does not decode Content-Encoding, so this is the size on the wire
+                size = len(resp.read())
+                status = resp.status
+        except urllib.error.HTTPError as e:
+            size = len(e.read())
+            status = e.code
+        except (urllib.error.URLError, OSError):
+            status = None
+        end = time.perf_counter()
+        ok = status == EXPECTED_STATUS[route]
+        self.recorder.add(route, self.history, start, end, ok, size)
+        return ok
+
+    def register(self) -> bool:
+        return self._request("register", "/register", [
+            ("username", self.username),
+            ("email", self.username + "@loadtest.local"),
+            ("password", self.password),
+        ])
+
+    def login(self) -> bool:
+        self._new_session()
+        return self._request("login", "/login", [
+            ("username", self.username),
+            ("password", self.password),
+        ])
+
+    def submit_trades(self, count: int) -> bool:
+        form = []
+        start_day = datetime(2025, 1, 1) + timedelta(days=self.history)
+        for i in range(count):
+            asset_name, asset_type = self.rng.choice(ASSETS)
+            entry_price = round(self.rng.uniform(10, 500), 2)
+            exit_price = round(entry_price * self.rng.uniform(0.85, 1.15), 2)
+            entry_time = start_day + timedelta(hours=i * 3)
+            exit_time = entry_time + timedelta(hours=self.rng.randint(1, 48))
+            form += [
+                ("asset_name[]", asset_name),
+                ("asset_type[]", asset_type),
+                ("entry_price[]", str(entry_price)),
+                ("exit_price[]", str(exit_price)),
+                ("account_size[]", "5000"),
+                ("fraction_invested[]", str(round(self.rng.uniform(0.02, 0.4), 3))),
+                ("entry_timestamp[]", entry_time.strftime("%Y-%m-%dT%H:%M")),
+                ("exit_timestamp[]", exit_time.strftime("%Y-%m-%dT%H:%M")),
+                ("direction[]", self.rng.choice(["long", "short"])),
+                ("trade_reason[]", self.rng.choice(REASONS)),
+                ("notes[]", self.rng.choice(NOTES)),
+            ]
+        ok = self._request("trade_input", "/trade_input", form)
+        if ok:
+            self.history += count
+        return ok
+
+    def results(self) -> bool:
+        return self._request("results", "/results")
+
+    def home(self) -> bool:
+        return self._request("home", "/home")
+
+    def run(self, rounds: int, trades_per_submit: int, think_time: float):
+        if not self.register() or not self.login():
+            return
+        for _ in range(rounds):
+            self.submit_trades(trades_per_submit)
+            self.results()
+            self.home()
+            if think_time:
+                time.sleep(self.rng.uniform(0, think_time))
+
+
+# -------------------
+# Server management
+# -------------------
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int, workers: int, database_url: str) -> subprocess.Popen:
+    env = dict(os.environ, DATABASE_URL=database_url)
+    # --preload imports app.py once so db.create_all() does not race between workers
+    cmd = [sys.executable, "-m", "gunicorn", "-b", f"127.0.0.1:{port}", "-w", str(workers),
+           "--preload", "--log-level", "warning", "app:app"]
+    proc = subprocess.Popen(cmd, cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with code {proc.returncode}")
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/intro", timeout=1).read()
+            return proc
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("gunicorn did not become ready within 30s")
+
+
+def stop_server(proc: subprocess.Popen):
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+# -------------------
+# Reporting
+# -------------------
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank percentile
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(samples: List[Dict]) -> Dict:
+    latencies = sorted((s["end"] - s["start"]) * 1000.0 for s in samples)
+    errors = sum(1 for s in samples if not s["ok"])
+    total_bytes = sum(s["bytes"] for s in samples)
+    span = max(s["end"] for s in samples) - min(s["start"] for s in samples) if samples else 0.0
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": errors / len(samples) if samples else 0.0,
+        "throughput_rps": len(samples) / span if span > 0 else 0.0,
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+        "p99_ms": _percentile(latencies, 99),
+        "max_ms": latencies[-1] if latencies else 0.0,
+        "total_bytes": total_bytes,
+        "avg_bytes": total_bytes / len(samples) if samples else 0.0,
+    }
+
+
+def build_report(samples: List[Dict], config: Dict, elapsed: float, bucket_size: int) -> Dict:
+    by_route = defaultdict(list)
+    for s in samples:
+        by_route[s["route"]].append(s)
+
+    routes = {}
+    for route in ROUTES:
+        route_samples = by_route.get(route, [])
+        buckets = defaultdict(list)
+        for s in route_samples:
+            low = s["history"] // bucket_size * bucket_size
+            buckets[low].append(s)
+        routes[route] = {
+            "overall": summarize(route_samples),
+            "by_history": {
+                f"{low}-{low + bucket_size - 1}": summarize(buckets[low]) for low in sorted(buckets)
+            },
+        }
+
+    return {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "git_rev": _git_rev(),
+        "config": config,
+        "elapsed_s": elapsed,
+        "total": summarize(samples),
+        "routes": routes,
+    }
+
+
+def _git_rev() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                             capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def print_report(report: Dict):
+    header = f"{'route':<12} {'history':>9} {'reqs':>6} {'err%':>6} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'avg KB':>8}"
+    print(header)
+    print("-" * len(header))
+    for route, data in report["routes"].items():
+        rows = [("all", data["overall"])] + list(data["by_history"].items())
+        for label, st in rows:
+            print(f"{route:<12} {label:>9} {st['requests']:>6} {st['error_rate'] * 100:>5.1f}% "
+                  f"{st['throughput_rps']:>8.1f} {st['p50_ms']:>8.1f} {st['p95_ms']:>8.1f} {st['p99_ms']:>8.1f} "
+                  f"{st['avg_bytes'] / 1024:>8.1f}")
+    total = report["total"]
+    print(f"\nTotal: {total['requests']} requests in {report['elapsed_s']:.1f}s "
+          f"({total['throughput_rps']:.1f} req/s, {total['error_rate'] * 100:.1f}% errors, "
+          f"{total['total_bytes'] / 1024:.1f} KB received)")
+
+
+def print_comparison(before: Dict, after: Dict):
+    print(f"\nComparison: {before.get('git_rev')} ({before['generated_at']}) -> "
+          f"{after.get('git_rev')} ({after['generated_at']})")
+    header = f"{'route':<12} {'metric':<15} {'before':>10} {'after':>10} {'change':>9}"
+    print(header)
+    print("-" * len(header))
+    for route in ROUTES:
+        old = before["routes"].get(route, {}).get("overall")
+        new = after["routes"].get(route, {}).get("overall")
+        if not old or not new:
+            continue
+        for metric in ["p50_ms", "p95_ms", "p99_ms", "throughput_rps", "error_rate", "avg_bytes"]:
+            if metric not in old or metric not in new:
+                continue
+            a, b = old[metric], new[metric]
+            change = f"{(b - a) / a * 100:+.1f}%" if a else "n/a"
+            print(f"{route:<12} {metric:<15} {a:>10.2f} {b:>10.2f} {change:>9}")
+
+
+# -------------------
+# Entry point
+# -------------------
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Load-test the MindTrade routes against a local gunicorn.")
+    p.add_argument("--users", type=int, default=10, help="concurrent simulated users")
+    p.add_argument("--rounds", type=int, default=10, help="trade_input/results/home cycles per user")
+    p.add_argument("--trades-per-submit", type=int, default=5, help="trade rows per trade_input POST (max 10 in the UI)")
+    p.add_argument("--think-time", type=float, default=0.0, help="max random pause between rounds, in seconds")
+    p.add_argument("--workers", type=int, default=2, help="gunicorn worker processes")
+    p.add_argument("--port", type=int, default=0, help="port for gunicorn (default: any free port)")
+    p.add_argument("--database-url", help="DATABASE_URL for the server (default: fresh temporary SQLite file)")
+    p.add_argument("--base-url", help="hit an already running server instead of starting gunicorn")
+    p.add_argument("--bucket-size", type=int, default=10, help="history size band width in the report, in trades")
+    p.add_argument("--timeout", type=float, default=30.0, help="per-request timeout, in seconds")
+    p.add_argument("--accept-encoding", default="gzip, br",
+                   help="Accept-Encoding header sent with every request (empty string to send none)")
+    p.add_argument("--seed", type=int, default=1, help="random seed for generated trades")
+    p.add_argument("--out", default="loadtest_report.json", help="where to write the JSON report")
+    p.add_argument("--compare", help="previous JSON report to compare against")
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    tmp_db = None
+    proc = None
+    base_url = args.base_url.rstrip("/") if args.base_url else None
+    if not base_url:
+        database_url = args.database_url
+        if not database_url:
+            fd, tmp_db = tempfile.mkstemp(prefix="mindtrade-loadtest-", suffix=".db")
+            os.close(fd)
+            database_url = f"sqlite:///{tmp_db}"
+        port = args.port or _free_port()
+        print(f"🚀 Starting gunicorn on port {port} ({args.workers} workers)")
+        proc = start_server(port, args.workers, database_url)
+        base_url = f"http://127.0.0.1:{port}"
+
+    recorder = Recorder()
+    # Unique per run so repeated runs against a persistent database never collide
+    run_id = uuid.uuid4().hex[:8]
+    users = [
+        SimulatedUser(base_url, f"lt{run_id}_{i}", recorder, random.Random(args.seed + i), args.timeout,
+                      args.accept_encoding)
+        for i in range(args.users)
+    ]
+    threads = [
+        threading.Thread(target=u.run, args=(args.rounds, args.trades_per_submit, args.think_time))
+        for u in users
+    ]
+
+    try:
+        print(f"⏱  Running {args.users} users x {args.rounds} rounds against {base_url}")
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+    finally:
+        if proc:
+            stop_server(proc)
+        if tmp_db and os.path.exists(tmp_db):
+            os.remove(tmp_db)
+
+    config = {k: v for k, v in vars(args).items() if k not in ("out", "compare", "database_url")}
+    config["database"] = "sqlite (temporary)" if tmp_db else ("external" if args.base_url else "DATABASE_URL")
+    report = build_report(recorder.samples, config, elapsed, args.bucket_size)
+
+    print()
+    print_report(report)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Report written to {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()